@@ -39,6 +39,7 @@ from pav.shared.config import (
 )
 from pav.shared.kubernetes import (
     atomically_modify_persistent_volume_claim,
+    create_api_client,
     get_all_persistent_volume_claims,
     get_all_pods,
     synchronously_delete_csi_driver,
@@ -53,7 +54,7 @@ def run(image: str) -> None:
 
     # create Kubernetes API client object
 
-    api_client = ApiClient()
+    api_client = create_api_client()
 
     # define handlers
 
@@ -19,7 +19,7 @@ from pav.agent.common import (
     handle_volume_staging,
 )
 from pav.shared.config import KOPF_FINALIZER
-from pav.shared.kubernetes import parse_and_round_quantity
+from pav.shared.kubernetes import create_api_client, parse_and_round_quantity
 from pav.shared.pods import Pod
 from pav.shared.states import (
     VolumeProvisioningState,
@@ -36,7 +36,7 @@ def run(node_name: str) -> None:
 
     # create Kubernetes API client object
 
-    api_client = ApiClient()
+    api_client = create_api_client()
 
     # define handlers
 
@@ -8,7 +8,6 @@ from signal import SIGTERM
 from typing import Optional
 
 import grpc.aio  # type: ignore
-from kubernetes_asyncio.client import ApiClient  # type: ignore
 
 from pav.csi.controller import Controller
 from pav.csi.identity import Identity
@@ -19,7 +18,7 @@ from pav.csi.spec.csi_pb2_grpc import (
     add_NodeServicer_to_server,
 )
 from pav.shared.config import CSI_SOCKET_PATH
-from pav.shared.kubernetes import ClusterObjectRef
+from pav.shared.kubernetes import ClusterObjectRef, create_api_client
 
 # ---------------------------------------------------------------------------- #
 
@@ -36,7 +35,7 @@ async def _run_async(
     provisioner_ref: ClusterObjectRef, node_name: Optional[str]
 ) -> None:
 
-    async with ApiClient() as api_client:
+    async with create_api_client() as api_client:
 
         # set up CSI plugin server
 
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine
-from dataclasses import dataclass
-from decimal import ROUND_HALF_EVEN, Decimal
+import re
+from asyncio import Lock
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_EVEN, Decimal
+from functools import lru_cache
 from http import HTTPStatus
 from typing import Any, Optional, TypeVar
 
@@ -12,6 +16,7 @@ from kubernetes.utils import parse_quantity  # type: ignore
 from kubernetes_asyncio.client import (  # type: ignore
     ApiClient,
     ApiException,
+    Configuration,
     CoreV1Api,
     StorageV1Api,
     V1PersistentVolumeClaim,
@@ -22,6 +27,23 @@ from kubernetes_asyncio.watch import Watch  # type: ignore
 # ---------------------------------------------------------------------------- #
 
 
+def create_api_client() -> ApiClient:
+    """
+    Create a Kubernetes API client object from the default configuration.
+
+    All requests made through the returned client share a single pool of
+    keep-alive connections to the API server. Watches hold on to a connection
+    for as long as they run, and many of them may be active at once (e.g., one
+    per pod being waited on), so the pool is left unbounded to ensure that
+    other requests never queue up behind them.
+    """
+
+    configuration = Configuration.get_default_copy()
+    configuration.connection_pool_maxsize = None
+
+    return ApiClient(configuration)
+
+
 @dataclass(frozen=True)
 class ObjectRef:
     name: str
@@ -35,10 +57,106 @@ class ClusterObjectRef:
     uid: str
 
 
+_QUANTITY_REGEX = re.compile(
+    r"([+-]?)([0-9]*)(?:\.([0-9]*))?(Ki|Mi|Gi|Ti|Pi|Ei|n|u|m|k|K|M|G|T|P|E)?"
+)
+
+_QUANTITY_SUFFIX_FACTORS: dict[Optional[str], tuple[int, int]] = {
+    None: (1, 1),
+    "n": (1, 1000 ** 3),
+    "u": (1, 1000 ** 2),
+    "m": (1, 1000),
+    "k": (1000, 1),
+    "K": (1000, 1),
+    "M": (1000 ** 2, 1),
+    "G": (1000 ** 3, 1),
+    "T": (1000 ** 4, 1),
+    "P": (1000 ** 5, 1),
+    "E": (1000 ** 6, 1),
+    "Ki": (1024, 1),
+    "Mi": (1024 ** 2, 1),
+    "Gi": (1024 ** 3, 1),
+    "Ti": (1024 ** 4, 1),
+    "Pi": (1024 ** 5, 1),
+    "Ei": (1024 ** 6, 1),
+}
+"""The numerator and denominator of the factor that each suffix stands for."""
+
+
 def parse_and_round_quantity(
     quantity: object, *, rounding_mode: str = ROUND_HALF_EVEN
 ) -> int:
 
+    # fast path for integers and decimal quantities with an optional suffix,
+    # which are parsed and rounded using exact integer arithmetic
+
+    if isinstance(quantity, int):
+        return int(quantity)
+
+    if isinstance(quantity, str):
+
+        match = _QUANTITY_REGEX.fullmatch(quantity)
+
+        if match is not None and (match[2] or match[3]):
+
+            result = _round_quantity(
+                sign=match[1],
+                integer_digits=match[2],
+                fraction_digits=match[3] or "",
+                suffix=match[4],
+                rounding_mode=rounding_mode,
+            )
+
+            if result is not None:
+                return result
+
+    # slow path for everything else, e.g., exponent notation or uncommon
+    # rounding modes, which is memoized for strings as the same few quantities
+    # keep showing up
+
+    if isinstance(quantity, str):
+        return _parse_and_round_quantity_str(quantity, rounding_mode)
+    else:
+        return _parse_and_round_quantity(quantity, rounding_mode)
+
+
+def _round_quantity(
+    sign: str,
+    integer_digits: str,
+    fraction_digits: str,
+    suffix: Optional[str],
+    rounding_mode: str,
+) -> Optional[int]:
+    """Return `None` if rounding is needed with an unsupported mode."""
+
+    (numerator, denominator) = _QUANTITY_SUFFIX_FACTORS[suffix]
+    fraction_scale: int = 10 ** len(fraction_digits)
+
+    numerator *= int(f"{sign}{integer_digits}{fraction_digits}")
+    denominator *= fraction_scale
+
+    (quotient, remainder) = divmod(numerator, denominator)
+
+    if remainder == 0 or rounding_mode == ROUND_FLOOR:
+        return quotient
+    elif rounding_mode == ROUND_CEILING:
+        return quotient + 1
+    elif rounding_mode == ROUND_HALF_EVEN:
+        if 2 * remainder == denominator:
+            return quotient + quotient % 2
+        else:
+            return quotient + (2 * remainder > denominator)
+    else:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_and_round_quantity_str(quantity: str, rounding_mode: str) -> int:
+    return _parse_and_round_quantity(quantity, rounding_mode)
+
+
+def _parse_and_round_quantity(quantity: object, rounding_mode: str) -> int:
+
     parsed = parse_quantity(quantity)
     assert isinstance(parsed, Decimal)
 
@@ -85,14 +203,69 @@ async def _get_all_objects(
     field_selector: Optional[str] = None,
 ) -> list[Any]:
 
-    objects = await list_fn(
-        label_selector=label_selector, field_selector=field_selector
-    )
+    return [
+        obj
+        async for obj in _iter_all_objects(
+            list_fn=list_fn,
+            label_selector=label_selector,
+            field_selector=field_selector,
+        )
+    ]
+
+
+async def _iter_all_objects(
+    list_fn: Callable[..., Coroutine[Any, Any, Any]],
+    *,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+) -> AsyncIterator[Any]:
+
+    async for page in _iter_object_list_pages(
+        list_fn=list_fn,
+        label_selector=label_selector,
+        field_selector=field_selector,
+    ):
+        for obj in page.items:
+            yield obj
+
+
+_LIST_PAGE_SIZE = 500
+"""Maximum number of objects to retrieve per list request."""
+
+
+async def _iter_object_list_pages(
+    list_fn: Callable[..., Coroutine[Any, Any, Any]],
+    *,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yield the pages of a paginated list request.
+
+    All pages are part of the same consistent snapshot, and share the resource
+    version of that snapshot. Fails with `ApiException` with status 410 GONE if
+    the snapshot expires before all pages are retrieved.
+    """
+
+    continue_token: Optional[str] = None
+
+    while True:
+
+        page = await list_fn(
+            label_selector=label_selector,
+            field_selector=field_selector,
+            limit=_LIST_PAGE_SIZE,
+            _continue=continue_token,
+        )
 
-    assert not objects.metadata._continue
-    assert type(objects.items) is list
+        assert type(page.items) is list
 
-    return objects.items
+        yield page
+
+        continue_token = page.metadata._continue
+
+        if not continue_token:
+            return
 
 
 # ---------------------------------------------------------------------------- #
@@ -167,23 +340,36 @@ async def _synchronously_delete_object(
 
     # wait until object is deleted
 
-    field_selector = f"metadata.name={name}"
-
-    if namespace is not None:
-        field_selector += f",metadata.namespace={namespace}"
-
     async def callback(obj: Any, exists: bool) -> None:
         if not exists:
             raise StopAsyncIteration
 
     await _watch_all_objects(
         list_fn=list_fn,
-        field_selector=field_selector,
+        field_selector=_get_object_field_selector(name, namespace),
         return_if_no_matches=True,
         callback=callback,
     )
 
 
+def _get_object_field_selector(name: str, namespace: Optional[str]) -> str:
+    """
+    Return a field selector matching only the object with the given name (and
+    namespace, if not `None`).
+
+    The selector is built once and reused across all list and watch requests
+    of a watch session. It is deliberately not URL-encoded here, since the
+    kubernetes_asyncio REST client always encodes query parameters itself.
+    """
+
+    field_selector = f"metadata.name={name}"
+
+    if namespace is not None:
+        field_selector += f",metadata.namespace={namespace}"
+
+    return field_selector
+
+
 # ---------------------------------------------------------------------------- #
 
 T = TypeVar("T")
@@ -245,10 +431,7 @@ async def _watch_object(
     # It seems we can't use watches with read_... functions because they don't
     # accept resource_version arguments.
 
-    field_selector = f"metadata.name={name}"
-
-    if namespace is not None:
-        field_selector += f",metadata.namespace={namespace}"
+    field_selector = _get_object_field_selector(name, namespace)
 
     uid: Optional[str] = None
     result: Optional[T] = None
@@ -347,29 +530,56 @@ async def _watch_all_objects(
     if no matching object is initially found.
     """
 
-    while True:
+    # Watch objects are reused across reconnects, as each one creates and
+    # internally holds its own API client object (which it uses for
+    # deserializing received objects).
 
-        # list
+    async with Watch() as watch:
 
-        obj_list = await list_fn(
-            label_selector=label_selector, field_selector=field_selector
-        )
+        while True:
 
-        if not obj_list.items and return_if_no_matches:
-            return
+            # list
 
-        for obj in obj_list.items:
+            resource_version: Optional[str] = None
+            found_matches = False
+            is_callback_api_exception = False
 
             try:
-                await callback(obj, True)
-            except StopAsyncIteration:
-                return  # callback requested stop, return
 
-        # watch
+                async for page in _iter_object_list_pages(
+                    list_fn=list_fn,
+                    label_selector=label_selector,
+                    field_selector=field_selector,
+                ):
 
-        is_callback_api_exception = False
+                    resource_version = page.metadata.resource_version
 
-        async with Watch() as watch:
+                    for obj in page.items:
+
+                        found_matches = True
+
+                        try:
+                            await callback(obj, True)
+                        except StopAsyncIteration:
+                            return  # callback requested stop, return
+                        except ApiException:
+                            is_callback_api_exception = True
+                            raise
+
+            except ApiException as e:
+
+                if (
+                    not is_callback_api_exception
+                    and e.status == HTTPStatus.GONE
+                ):
+                    continue  # took too long to retrieve all pages, retry
+                else:
+                    raise  # some other error occurred, fail
+
+            if not found_matches and return_if_no_matches:
+                return
+
+            # watch
 
             try:
 
@@ -377,7 +587,7 @@ async def _watch_all_objects(
                     list_fn,
                     label_selector=label_selector,
                     field_selector=field_selector,
-                    resource_version=obj_list.metadata.resource_version,
+                    resource_version=resource_version,
                 )
 
                 async for event in stream:
@@ -462,40 +672,78 @@ async def _atomically_modify_object(
     if namespace is not None:
         kwargs["namespace"] = namespace
 
-    while True:
+    # Concurrent modifications of the same object from within this process are
+    # serialized, as they would otherwise mostly just conflict with each other
+    # and have to be retried.
 
-        # retrieve object
+    async with _lock_object((read_fn.__name__, namespace, name)):
 
-        obj = await read_fn(**kwargs)
+        while True:
 
-        # adjust object
+            # retrieve object
 
-        original_obj_dict = obj.to_dict()
+            obj = await read_fn(**kwargs)
 
-        result = modifier(obj)
+            # adjust object
 
-        if hasattr(result, "__await__"):
-            await result
+            original_obj_dict = obj.to_dict()
 
-        if obj.to_dict() == original_obj_dict:
-            break  # no changes necessary
+            result = modifier(obj)
 
-        # replace object
+            if hasattr(result, "__await__"):
+                await result
 
-        try:
+            if obj.to_dict() == original_obj_dict:
+                break  # no changes necessary
 
-            return await replace_fn(**kwargs, body=obj)
+            # replace object
 
-        except ApiException as e:
+            try:
 
-            # If we failed with 409 CONFLICT, it means that the object's
-            # 'metadata.resourceVersion' field has a different value from when
-            # we retrieved it. This means that the object was modified in
-            # between our read_fn() and replace_fn() calls, in which case we
-            # must re-read the object and retry.
+                return await replace_fn(**kwargs, body=obj)
 
-            if e.status != HTTPStatus.CONFLICT:
-                raise  # some unexpected error occurred
+            except ApiException as e:
+
+                # If we failed with 409 CONFLICT, it means that the object's
+                # 'metadata.resourceVersion' field has a different value from
+                # when we retrieved it. This means that the object was modified
+                # in between our read_fn() and replace_fn() calls, in which case
+                # we must re-read the object and retry.
+
+                if e.status != HTTPStatus.CONFLICT:
+                    raise  # some unexpected error occurred
+
+
+@dataclass
+class _ObjectLock:
+    lock: Lock = field(default_factory=Lock)
+    users: int = 0
+
+
+_object_locks: dict[tuple[str, Optional[str], str], _ObjectLock] = {}
+
+
+@asynccontextmanager
+async def _lock_object(
+    key: tuple[str, Optional[str], str]
+) -> AsyncIterator[None]:
+    """Hold a process-wide lock associated with the given key. The lock is
+    forgotten once no one is holding or waiting for it."""
+
+    object_lock = _object_locks.get(key)
+
+    if object_lock is None:
+        object_lock = _object_locks[key] = _ObjectLock()
+
+    object_lock.users += 1
+
+    try:
+        async with object_lock.lock:
+            yield
+    finally:
+        object_lock.users -= 1
+        if object_lock.users == 0:
+            del _object_locks[key]
 
 
 # ---------------------------------------------------------------------------- #
@@ -6,11 +6,12 @@ import subprocess
 from asyncio import sleep
 from copy import deepcopy
 from http import HTTPStatus
+from itertools import chain
 from pathlib import Path, PurePath
 from shutil import rmtree
 from typing import Any, Optional, Union
 
-import yaml
+import orjson
 from kubernetes_asyncio.client import (  # type: ignore
     ApiClient,
     ApiException,
@@ -45,7 +46,7 @@ class PodTemplate:
 
         # deep copy while ensuring that only primitive-ish types are used
 
-        template = yaml.safe_load(yaml.safe_dump(pod_template_spec))
+        template = _json_deep_copy(pod_template_spec)
 
         # create minimal pod definition from template
 
@@ -120,7 +121,7 @@ class PodTemplate:
 
         return PodTemplate(
             api_client=api_client,
-            template=yaml.safe_load(yaml.safe_dump(pod_template_spec)),
+            template=_json_deep_copy(pod_template_spec),
         )
 
     __api_client: ApiClient
@@ -227,8 +228,17 @@ class PodTemplate:
 
         # mount /pav volume in all containers
 
-        all_containers = (
-            pod["spec"].get("initContainers", []) + pod["spec"]["containers"]
+        # NOTE: The same volume mount objects are shared by all containers,
+        # which is fine since the pod definition is only ever serialized.
+
+        volume_mount = {"name": "pav", "mountPath": "/pav"}
+
+        bidirectional_volume_mount = volume_mount | {
+            "mountPropagation": "Bidirectional"
+        }
+
+        all_containers = chain(
+            pod["spec"].get("initContainers", []), pod["spec"]["containers"]
         )
 
         for container in all_containers:
@@ -237,18 +247,28 @@ class PodTemplate:
                 "privileged", False
             )
 
-            volume_mount = {"name": "pav", "mountPath": "/pav"}
-
             if pav_volume_bidirectional_mount_propagation and privileged:
-                volume_mount["mountPropagation"] = "Bidirectional"
+                mount = bidirectional_volume_mount
+            else:
+                mount = volume_mount
 
-            container.setdefault("volumeMounts", []).insert(0, volume_mount)
+            container.setdefault("volumeMounts", []).insert(0, mount)
 
         # return pod definition
 
         return pod
 
 
+def _json_deep_copy(obj: object) -> Any:
+    """Deep copy the given object, raising ValueError if it contains anything
+    other than JSON-compatible types (e.g., non-string mapping keys)."""
+
+    try:
+        return orjson.loads(orjson.dumps(obj))
+    except orjson.JSONEncodeError as e:
+        raise ValueError(str(e))
+
+
 # ---------------------------------------------------------------------------- #
 
 
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+import json
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from decimal import ROUND_CEILING, ROUND_FLOOR
 from enum import Enum, unique
-from pathlib import Path
+from functools import lru_cache
+from importlib import resources
 from typing import Any, Optional
 
-import yamale  # type: ignore
 from jinja2 import TemplateError
+from jsonschema import Draft202012Validator  # type: ignore
+from jsonschema.validators import extend  # type: ignore
 from kubernetes_asyncio.client import (  # type: ignore
     ApiClient,
     CustomObjectsApi,
@@ -27,7 +30,11 @@ from pav.shared.config import (
 )
 from pav.shared.kubernetes import parse_and_round_quantity
 from pav.shared.pods import PodTemplate
-from pav.shared.templating import evaluate_templates, validate_templates
+from pav.shared.templating import (
+    evaluate_templates,
+    has_templates,
+    validate_templates,
+)
 
 # ---------------------------------------------------------------------------- #
 
@@ -45,6 +52,9 @@ class AccessMode(Enum):
     READ_WRITE_MANY = "ReadWriteMany"
 
 
+_DEFAULT_VOLUME_MODES = frozenset({VolumeMode.FILE_SYSTEM})
+_DEFAULT_ACCESS_MODES = frozenset(AccessMode)
+
 # ---------------------------------------------------------------------------- #
 
 
@@ -107,38 +117,76 @@ class VolumeUnstagingConfig:
 # ---------------------------------------------------------------------------- #
 
 
-class Provisioner:
+@lru_cache(maxsize=1)
+def _get_schema() -> Any:
+    """The provisioner JSON Schema, loaded on first use."""
+    schema_file = resources.files("pav.shared") / "provisioner-schema.json"
+    return json.loads(schema_file.read_text())
 
-    __SCHEMA_TEXT = (
-        Path(__file__).parent / "provisioner-schema.yaml"
-    ).read_text()
 
-    __SCHEMA = yamale.make_schema(
-        content=__SCHEMA_TEXT.format(template="include('template'),")
-    )
+_TEMPLATE_FIELDS = (
+    "volumeValidation",
+    "volumeCreation",
+    "volumeDeletion",
+    "volumeStaging",
+    "volumeUnstaging",
+)
+"""The provisioner spec fields that may contain templates."""
+
+# Don't consider bools or floats with no fractional part to be integers.
+_JsonSchemaValidator = extend(
+    Draft202012Validator,
+    type_checker=Draft202012Validator.TYPE_CHECKER.redefine(
+        "integer",
+        lambda checker, value: (
+            isinstance(value, int) and not isinstance(value, bool)
+        ),
+    ),
+)
+
+
+@lru_cache(maxsize=1)
+def _get_validator() -> Any:
+    """Validator for whole provisioner objects, with templates."""
+    return _JsonSchemaValidator(_get_schema())
 
-    __SCHEMA_WITHOUT_TEMPLATES = yamale.make_schema(
-        content=__SCHEMA_TEXT.format(template="")
+
+@lru_cache(maxsize=None)
+def _get_field_validator(field: str) -> Any:
+    """Validator for the given spec field, after evaluating its templates."""
+    return _JsonSchemaValidator(
+        {"$defs": _get_schema()["$defs"], "$ref": f"#/$defs/{field}"}
     )
 
+
+def _format_errors(errors: Iterable[Any], path: Sequence[str]) -> str:
+
+    lines = []
+
+    for e in sorted(errors, key=lambda e: list(map(str, e.absolute_path))):
+        error_path = ".".join([*path, *map(str, e.absolute_path)])
+        lines.append(f"{error_path}: {e.message}" if error_path else e.message)
+
+    return "".join(f"\n  {line}" for line in lines)
+
+
+class Provisioner:
     @staticmethod
     def validate(obj: Any) -> None:
 
         # validate whole provisioner against schema
 
-        try:
-            yamale.validate(schema=Provisioner.__SCHEMA, data=[(obj, None)])
-        except yamale.YamaleError as e:
-            assert len(e.results) == 1
-            raise ValueError(
-                "".join(f"\n  {msg}" for msg in e.results[0].errors)
-            )
+        errors = list(_get_validator().iter_errors(obj))
+
+        if errors:
+            raise ValueError(_format_errors(errors, path=[]))
 
         # validate template syntax
 
         try:
-            for key in obj["spec"].keys() - {"provisioningModes"}:
-                validate_templates(obj["spec"][key])
+            for field in _TEMPLATE_FIELDS:
+                if field in obj["spec"]:
+                    validate_templates(obj["spec"][field])
         except TemplateError as e:
             raise ValueError(e.message)
 
@@ -154,9 +202,21 @@ class Provisioner:
 
         return Provisioner(api_client, obj)
 
+    __slots__ = (
+        "__api_client",
+        "__obj",
+        "__name",
+        "__spec",
+        "__has_dynamic_provisioning",
+        "__static_fields",
+    )
+
     __api_client: ApiClient
     __obj: Any
     __name: str
+    __spec: Any
+    __has_dynamic_provisioning: bool
+    __static_fields: frozenset[str]
 
     def __init__(self, api_client: ApiClient, obj: object) -> None:
         """PRIVATE, DO NOT USE."""
@@ -168,6 +228,17 @@ class Provisioner:
         assert isinstance(name, str)
         self.__name = name
 
+        self.__spec = self.__obj["spec"]
+        self.__has_dynamic_provisioning = (
+            "Dynamic" in self.__spec["provisioningModes"]
+        )
+
+        self.__static_fields = frozenset(
+            field
+            for field in _TEMPLATE_FIELDS
+            if not has_templates(self.__spec.get(field, {}))
+        )
+
     @property
     def name(self) -> str:
         return self.__name
@@ -202,17 +273,15 @@ class Provisioner:
 
         # perform additional validation
 
-        volume_modes = frozenset(
-            VolumeMode(mode) for mode in obj.get("volumeModes", ["Filesystem"])
-        )
+        if "volumeModes" in obj:
+            volume_modes = frozenset(map(VolumeMode, obj["volumeModes"]))
+        else:
+            volume_modes = _DEFAULT_VOLUME_MODES
 
-        access_modes = frozenset(
-            AccessMode(mode)
-            for mode in obj.get(
-                "accessModes",
-                ["ReadWriteOnce", "ReadOnlyMany", "ReadWriteMany"],
-            )
-        )
+        if "accessModes" in obj:
+            access_modes = frozenset(map(AccessMode, obj["accessModes"]))
+        else:
+            access_modes = _DEFAULT_ACCESS_MODES
 
         minimum_capacity = self.__parse_capacity(
             obj.get("minCapacity", 1), ROUND_FLOOR
@@ -265,7 +334,7 @@ class Provisioner:
         capacity = self.__parse_capacity_opt(obj.get("capacity"), ROUND_FLOOR)
 
         if (
-            "Dynamic" in self.__obj["spec"]["provisioningModes"]
+            self.__has_dynamic_provisioning
             and "capacity" not in obj
             and "podTemplate" not in obj
         ):
@@ -439,28 +508,36 @@ class Provisioner:
         self, field: str, context: Mapping[str, object]
     ) -> Any:
 
+        # fields without templates evaluate to themselves, so only validate them
+
+        if field in self.__static_fields:
+            obj = self.__spec.get(field, {})
+            self.__validate_spec_field(field, obj)
+            return obj
+
         # evaluate templates under the field
 
         evaluated_obj = await evaluate_templates(
-            obj=self.__obj["spec"].get(field, {}),
+            obj=self.__spec.get(field, {}),
             context=context,
             api_client=self.__api_client,
         )
 
         # validate resulting object
 
-        try:
-            yamale.validate(
-                schema=Provisioner.__SCHEMA_WITHOUT_TEMPLATES.includes[field],
-                data=[(evaluated_obj, None)],
-            )
-        except yamale.YamaleError as e:
-            raise ValueError(str(e))
+        self.__validate_spec_field(field, evaluated_obj)
 
         # return field object
 
         return evaluated_obj
 
+    def __validate_spec_field(self, field: str, obj: object) -> None:
+
+        errors = list(_get_field_validator(field).iter_errors(obj))
+
+        if errors:
+            raise ValueError(_format_errors(errors, path=["spec", field]))
+
     def __parse_capacity(self, capacity: object, rounding_mode: str) -> int:
 
         cap = parse_and_round_quantity(capacity, rounding_mode=rounding_mode)
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from collections.abc import Callable, Mapping
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, ClassVar, Optional, TypeVar
+from typing import Any, ClassVar, Optional, TypeVar, get_origin, get_type_hints
 
+import orjson
 from grpc import StatusCode  # type: ignore
 
 # ---------------------------------------------------------------------------- #
@@ -26,13 +26,6 @@ class _State:
         str: str,
         Optional[int]: lambda i: None if i is None else str(i),
         Optional[str]: lambda s: s,
-        "StatusCode": lambda sc: sc.name,
-        "Path": str,
-        "int": str,
-        "bool": str,
-        "str": str,
-        "Optional[int]": lambda i: None if i is None else str(i),
-        "Optional[str]": lambda s: s,
     }
 
     __DECODE: ClassVar[Mapping[Any, Callable[[Any], Any]]] = {
@@ -43,31 +36,59 @@ class _State:
         str: str,
         Optional[int]: lambda v: None if v is None else int(v),
         Optional[str]: lambda v: v,
-        "StatusCode": lambda v: StatusCode[v],
-        "Path": Path,
-        "int": int,
-        "bool": bool,
-        "str": str,
-        "Optional[int]": lambda v: None if v is None else int(v),
-        "Optional[str]": lambda v: v,
     }
 
+    __ENCODERS: ClassVar[tuple[tuple[str, Callable[[Any], Any]], ...]]
+    __DECODERS: ClassVar[tuple[tuple[str, Callable[[Any], Any]], ...]]
+    __JSON_PREFIX: ClassVar[bytes]
+    __FIELD_NAMES: ClassVar[frozenset[str]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+
+        super().__init_subclass__(**kwargs)
+
+        # Precompute the encoder and decoder of each field. This runs before
+        # @dataclass processes the class, so fields are found through its
+        # (resolved) type hints instead of fields().
+
+        field_types = [
+            (name, type_)
+            for (name, type_) in get_type_hints(cls).items()
+            if get_origin(type_) is not ClassVar
+        ]
+
+        cls.__ENCODERS = tuple(
+            (name, _State.__ENCODE[type_]) for (name, type_) in field_types
+        )
+
+        cls.__DECODERS = tuple(
+            (name, _State.__DECODE[type_]) for (name, type_) in field_types
+        )
+
+        cls.__FIELD_NAMES = frozenset(name for (name, _) in field_types)
+
+        # to_json() output always starts with the class name, so serialize
+        # that part only once
+
+        cls.__JSON_PREFIX = orjson.dumps({"name": cls.__name__})[:-1]
+
     @classmethod
     def _from_json(
-        cls: type[_StateT], state_namespace_type: type, json_string: str
+        cls: type[_StateT],
+        state_namespace_type: type[_StateNamespace],
+        json_string: str,
     ) -> _StateT:
 
-        obj = json.loads(json_string)
+        obj = orjson.loads(json_string)
         assert isinstance(obj, dict) and all(type(key) is str for key in obj)
 
-        state_cls = vars(state_namespace_type)[obj.pop("name")]
+        state_cls = state_namespace_type._BY_NAME[obj.pop("name")]
         assert issubclass(state_cls, cls)
 
-        assert obj.keys() == {field.name for field in fields(state_cls)}
+        assert obj.keys() == state_cls.__FIELD_NAMES
 
         kwargs = {
-            field.name: _State.__DECODE[field.type](obj[field.name])
-            for field in fields(state_cls)
+            name: decode(obj[name]) for (name, decode) in state_cls.__DECODERS
         }
 
         state = state_cls(**kwargs)
@@ -78,11 +99,33 @@ class _State:
     def to_json(self) -> str:
 
         obj = {
-            field.name: _State.__ENCODE[field.type](getattr(self, field.name))
-            for field in fields(self)
+            name: encode(getattr(self, name))
+            for (name, encode) in type(self).__ENCODERS
         }
 
-        return json.dumps({"name": type(self).__name__} | obj)
+        if obj:
+            encoded = type(self).__JSON_PREFIX + b"," + orjson.dumps(obj)[1:]
+        else:
+            encoded = type(self).__JSON_PREFIX + b"}"
+
+        return encoded.decode()
+
+
+class _StateNamespace:
+
+    _BY_NAME: ClassVar[Mapping[str, type[_State]]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+
+        super().__init_subclass__(**kwargs)
+
+        # map the name of each state class in the namespace to the class itself
+
+        cls._BY_NAME = {
+            name: value
+            for (name, value) in vars(cls).items()
+            if isinstance(value, type) and issubclass(value, _State)
+        }
 
 
 # ---------------------------------------------------------------------------- #
@@ -109,7 +152,7 @@ class VolumeProvisioningStateWithFailure(VolumeProvisioningState):
     error_details: str
 
 
-class VolumeProvisioningStates:
+class VolumeProvisioningStates(_StateNamespace):
     """
     Possible states of the state machine for volume validation, creation, and
     deletion.
@@ -256,7 +299,7 @@ class VolumeStagingStateFailure(VolumeStagingState):
     error_details: str
 
 
-class VolumeStagingStates:
+class VolumeStagingStates(_StateNamespace):
     """
     Possible states of the state machine for volume staging and unstaging.
 
@@ -3,51 +3,111 @@
 from __future__ import annotations
 
 import shlex
+import string
+from asyncio import Future, ensure_future, gather
 from collections.abc import Mapping
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 import yaml
-from jinja2 import Undefined, UndefinedError
+from jinja2 import Template, Undefined, UndefinedError
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from kubernetes_asyncio.client import ApiClient, CoreV1Api  # type: ignore
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 # ---------------------------------------------------------------------------- #
 
 
-def validate_templates(obj: object) -> None:
+def validate_templates(obj: object) -> object:
     """
     Validate the _syntax_ of all templates in `obj`.
 
     Also ensures that all objects are bool, float, int, None, list, or dict, and
     that list items and dict values obey the same rule, and that dict keys are
     strings.
-    """
 
-    env = _create_env(context={}, api_client=None)
+    Returns the same as `compile_templates(obj)`, since the templates have to be
+    compiled to validate them anyway.
+    """
 
-    def validate(o: object) -> None:
+    def validate(o: object) -> object:
 
         if isinstance(o, dict):
 
+            new_o = {}
+
             for (key, value) in o.items():
                 if not isinstance(key, str):
                     raise ValueError("All mapping keys must be strings")
-                validate(value)
+                new_o[key] = validate(value)
+
+            return new_o
 
         elif isinstance(o, (list, tuple)):
 
-            for value in o:
-                validate(value)
+            return [validate(value) for value in o]
 
         elif isinstance(o, str):
 
-            env.compile(o)
+            return _compile_template(o) if _is_template(o) else o
+
+        elif isinstance(o, (bool, float, int, type(None))):
 
-        elif not isinstance(o, (bool, float, int, type(None))):
+            return o
+
+        else:
 
             raise ValueError(f"Unsupported type {type(o).__qualname__}")
 
-    validate(obj)
+    return validate(obj)
+
+
+def compile_templates(obj: object) -> object:
+    """
+    Return a copy of `obj` in which all string fields in maps and lists
+    (recursively) are replaced by their compiled Jinja templates. Strings that
+    `has_templates()` doesn't consider templates are kept as they are.
+
+    The result can be given to `evaluate_templates()` in place of `obj`, any
+    number of times, to avoid recompiling the templates on every evaluation.
+    """
+
+    def compile(o: object) -> object:
+
+        if isinstance(o, dict):
+            return {key: compile(value) for (key, value) in o.items()}
+        elif isinstance(o, (list, tuple)):
+            return [compile(item) for item in o]
+        elif isinstance(o, str) and _is_template(o):
+            return _compile_template(o)
+        else:
+            return o
+
+    return compile(obj)
+
+
+def has_templates(obj: object) -> bool:
+    """
+    Check whether evaluating templates in `obj` with `evaluate_templates()` may
+    result in anything other than (a copy of) `obj` itself.
+
+    This is conservative: strings are considered templates if they contain any
+    Jinja delimiters, but also if they contain characters that Jinja normalizes
+    (a trailing newline, or any carriage return).
+    """
+
+    if isinstance(obj, dict):
+        return any(map(has_templates, obj.values()))
+    elif isinstance(obj, (list, tuple)):
+        return any(map(has_templates, obj))
+    elif isinstance(obj, str):
+        return _is_template(obj)
+    else:
+        return False
 
 
 async def evaluate_templates(
@@ -66,118 +126,217 @@ async def evaluate_templates(
     template's evaluation is parsed as YAML, and the field takes on the
     resulting value.
 
+    `obj` may also be (or contain) the result of `compile_templates()`.
+
     `api_client` can be `None` to help writing tests.
     """
 
-    env = _create_env(context=context, api_client=api_client)
+    variables = dict(context)
 
-    async def evaluate(o: object) -> object:
+    if api_client is not None:
+        variables["get_pvc"] = _PvcGetter(api_client)
 
-        if isinstance(o, dict):
+    # Copy all maps and lists, and collect every template along with the
+    # container and key/index under which its result must be placed. Templates
+    # are collected in the order in which they appear in `obj`.
 
-            return {key: await evaluate(value) for (key, value) in o.items()}
+    root: list[object] = [obj]
+    stack: list[tuple[Any, Any]] = [(root, 0)]
+    fields: list[tuple[Any, Any, Template]] = []
 
-        elif isinstance(o, (list, tuple)):
+    while stack:
 
-            return [await evaluate(item) for item in o]
+        (container, key) = stack.pop()
+        o = container[key]
 
+        if isinstance(o, dict):
+            container[key] = new_dict = dict(o)
+            stack.extend((new_dict, k) for k in reversed(new_dict))
+        elif isinstance(o, (list, tuple)):
+            container[key] = new_list = list(o)
+            stack.extend((new_list, i) for i in reversed(range(len(o))))
         elif isinstance(o, str):
+            if _is_template(o):  # otherwise, it evaluates to itself
+                fields.append((container, key, _compile_template(o)))
+        elif isinstance(o, Template):
+            fields.append((container, key, o))
 
-            template = env.from_string(o)
+    # evaluate all templates concurrently, so that their I/O (e.g., get_pvc())
+    # overlaps
 
-            new_o = await template.render_async()
-            is_yaml = getattr(await template.make_module_async(), "yaml", False)
+    results = await gather(
+        *(_evaluate_template(t, variables) for (_, _, t) in fields),
+        return_exceptions=True,
+    )
 
-            if not isinstance(is_yaml, bool):
-                raise TypeError
+    # raise the error of the first failed template, if any, so that which one
+    # is reported doesn't depend on timing
 
-            if is_yaml:
-                new_o = yaml.safe_load(new_o)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
-            return new_o
+    # put results in place
 
-        else:
+    for ((container, key, _), result) in zip(fields, results):
+        container[key] = result
 
-            return o
+    return root[0]
 
-    return await evaluate(obj)
 
+async def _evaluate_template(
+    template: Template, variables: dict[str, object]
+) -> object:
 
-def _create_env(
-    context: Mapping[str, object], api_client: Optional[ApiClient]
-) -> ImmutableSandboxedEnvironment:
-    def finalize(value: object) -> object:
+    # A template module holds both the template's top-level variables and its
+    # output, so evaluate the template only once to get both.
 
-        # This custom finalizer allows operations like 'or' on undefined values,
-        # but doesn't allow expressions to evaluate to 'undefined'.
+    module = await template.make_module_async(variables)
 
-        if isinstance(value, Undefined):
-            raise UndefinedError("Expressions must not evaluate to undefined")
+    output = str(module)
+    is_yaml = getattr(module, "yaml", False)
 
-        if not isinstance(value, (str, int, float)):
-            raise TypeError(
-                "Expressions must evaluate to a string or numeric value"
-            )
+    if not isinstance(is_yaml, bool):
+        raise TypeError
 
-        return str(value)
+    if is_yaml:
+        return yaml.load(output, Loader=_YamlLoader)
+    else:
+        return output
 
-    def tobash(value: object) -> str:
 
-        # This function ensures that newlines are escaped using ANSI-C quoting:
-        # https://www.gnu.org/software/bash/manual/bash.html#ANSI_002dC-Quoting
+def _is_template(string: str) -> bool:
+    return (
+        "{{" in string
+        or "{%" in string
+        or "{#" in string
+        or "\r" in string
+        or string.endswith("\n")
+    )
 
-        if isinstance(value, Undefined):
-            raise UndefinedError(
-                "Filter 'tobash' may not be applied to undefined"
-            )
 
-        if not isinstance(value, (str, int, float)):
-            raise TypeError("Filter 'tobash' expects a string or numeric value")
+@lru_cache(maxsize=4096)
+def _compile_template(source: str) -> Template:
+    """
+    Compile the given template. This is memoized, as the same templates are
+    usually evaluated over and over again, and compiling them is expensive.
 
-        value_str = str(value)
+    Note that `Template` objects hold no evaluation state, so they can be shared
+    across concurrent evaluations.
+    """
+    return _ENV.from_string(source)
 
-        if value_str:
-            result = R"$'\n'".join(
-                (shlex.quote(s) if s else "") for s in value_str.split("\n")
-            )
-            assert "\n" not in result
-            return result
-        else:
-            return "''"
+
+def _create_env() -> ImmutableSandboxedEnvironment:
 
     env = ImmutableSandboxedEnvironment(
         trim_blocks=True,
         lstrip_blocks=True,
-        finalize=finalize,
+        finalize=_finalize,
         enable_async=True,
     )
 
-    env.filters["tobash"] = tobash
-    env.globals |= context
+    env.filters["tobash"] = _tobash
 
-    if api_client is not None:
+    return env
 
-        # so typechecker knows it never becomes None
-        api_client_copy = api_client
 
-        async def get_pvc(name: str, namespace: str) -> object:
+def _finalize(value: object) -> object:
 
-            if not isinstance(name, str) or not isinstance(namespace, str):
-                raise TypeError(
-                    "Arguments to function get_pvc() must be strings"
-                )
+    # This custom finalizer allows operations like 'or' on undefined values, but
+    # doesn't allow expressions to evaluate to 'undefined'.
 
-            api = CoreV1Api(api_client_copy)
+    if type(value) is str:
+        return value  # by far the most common case
 
-            pvc = await api.read_namespaced_persistent_volume_claim(
-                name=name, namespace=namespace
-            )
+    if isinstance(value, Undefined):
+        raise UndefinedError("Expressions must not evaluate to undefined")
 
-            return api_client_copy.sanitize_for_serialization(pvc)
+    if not isinstance(value, (str, int, float)):
+        raise TypeError(
+            "Expressions must evaluate to a string or numeric value"
+        )
 
-        env.globals["get_pvc"] = get_pvc
+    return str(value)
 
-    return env
+
+def _tobash(value: object) -> str:
+
+    # This function ensures that newlines are escaped using ANSI-C quoting:
+    # https://www.gnu.org/software/bash/manual/bash.html#ANSI_002dC-Quoting
+
+    if type(value) is str:
+        value_str = value  # by far the most common case
+    elif isinstance(value, Undefined):
+        raise UndefinedError("Filter 'tobash' may not be applied to undefined")
+    elif not isinstance(value, (str, int, float)):
+        raise TypeError("Filter 'tobash' expects a string or numeric value")
+    else:
+        value_str = str(value)
+
+    if value_str:
+        result = R"$'\n'".join(map(_quote_line, value_str.split("\n")))
+        assert "\n" not in result
+        return result
+    else:
+        return "''"
+
+
+# same as the characters that shlex.quote() leaves unquoted
+_SHELL_SAFE_CHARACTERS = frozenset(
+    string.ascii_letters + string.digits + "@%+=:,./-_"
+)
+
+
+def _quote_line(line: str) -> str:
+    if _SHELL_SAFE_CHARACTERS.issuperset(line):
+        return line  # also covers the empty line
+    else:
+        return shlex.quote(line)
+
+
+# The environment is never mutated after creation, and variables are given to
+# each evaluation separately, so a single one is shared by all templates.
+_ENV = _create_env()
+
+
+class _PvcGetter:
+    """
+    The `get_pvc()` function available to templates.
+
+    A new instance is created for each `evaluate_templates()` call. Each PVC is
+    retrieved at most once per instance, even if several templates request it
+    concurrently.
+    """
+
+    __slots__ = ("__api_client", "__api", "__pvcs")
+
+    def __init__(self, api_client: ApiClient) -> None:
+        self.__api_client = api_client
+        self.__api = CoreV1Api(api_client)
+        self.__pvcs: dict[tuple[str, str], Future[object]] = {}
+
+    async def __call__(self, name: str, namespace: str) -> object:
+
+        if not isinstance(name, str) or not isinstance(namespace, str):
+            raise TypeError("Arguments to function get_pvc() must be strings")
+
+        pvc = self.__pvcs.get((name, namespace))
+
+        if pvc is None:
+            pvc = ensure_future(self.__get(name, namespace))
+            self.__pvcs[(name, namespace)] = pvc
+
+        # templates can't mutate the result, so it can be shared between them
+        return await pvc
+
+    async def __get(self, name: str, namespace: str) -> object:
+
+        pvc = await self.__api.read_namespaced_persistent_volume_claim(
+            name=name, namespace=namespace
+        )
+
+        return self.__api_client.sanitize_for_serialization(pvc)
 
 
 # ---------------------------------------------------------------------------- #
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import re
 import struct
 from collections.abc import Callable, Iterable, MutableMapping, MutableSequence
 from datetime import datetime
 from fcntl import ioctl
+from itertools import islice
 from pathlib import Path
 from sys import stderr
 from typing import Optional, TypeVar, Union
@@ -17,8 +19,10 @@ U = TypeVar("U")
 
 
 def remove_if_in(sequence: MutableSequence[T], item: T) -> None:
-    if item in sequence:
+    try:
         sequence.remove(item)
+    except ValueError:
+        pass  # item not in sequence
 
 
 class NoDefaultValue:
@@ -47,26 +51,22 @@ def mutate_value(
 
 def ensure_singleton(iterable: Iterable[T]) -> T:
 
-    it = iter(iterable)
-    value = next(it)
+    values = list(islice(iterable, 2))
 
-    try:
-        next(it)
-    except StopIteration:
-        return value  # iterable is singleton
+    if len(values) == 1:
+        return values[0]  # iterable is singleton
+    elif not values:
+        raise StopIteration  # iterable is empty, just like next() would
     else:
         raise ValueError  # iterable has more than one element
 
 
 def ensure_empty_or_singleton(iterable: Iterable[T]) -> Optional[T]:
 
-    it = iter(iterable)
-    value = next(it, None)
+    values = list(islice(iterable, 2))
 
-    try:
-        next(it)
-    except StopIteration:
-        return value  # iterable is empty or singleton
+    if len(values) <= 1:
+        return values[0] if values else None  # iterable is empty or singleton
     else:
         raise ValueError  # iterable has more than one element
 
@@ -82,20 +82,35 @@ def log(obj: object) -> None:
 # ---------------------------------------------------------------------------- #
 
 
+_BLKGETSIZE64_STRUCT = struct.Struct("Q")  # native-endian u64
+
+
 def get_block_device_size(path: Path) -> int:
     """Result is in bytes."""
 
     command = 0x80081272  # BLKGETSIZE64
 
+    buffer = bytearray(_BLKGETSIZE64_STRUCT.size)
+
     with path.open("rb") as file:
-        buffer = ioctl(file, command, b" " * 8)
+        ioctl(file, command, buffer)  # fills in buffer
 
-    size = struct.unpack("Q", buffer)[0]
+    (size,) = _BLKGETSIZE64_STRUCT.unpack(buffer)
     assert type(size) is int
 
     return size
 
 
+# mountinfo escapes some characters in paths (e.g., spaces) as \ooo
+_MOUNTINFO_ESCAPE_REGEX = re.compile(rb"\\([0-7]{3})")
+
+
+def _decode_mountinfo_path(b: bytes) -> Path:
+    if b"\\" in b:
+        b = _MOUNTINFO_ESCAPE_REGEX.sub(lambda m: bytes([int(m[1], 8)]), b)
+    return Path(b.decode("utf-8"))
+
+
 def find_top_level_mounts(directory_path: Path) -> set[Path]:
     """Return a sequence of all mount points under the given directory
     (excluding the directory itself) that are top-level, i.e., that themselves
@@ -104,26 +119,48 @@ def find_top_level_mounts(directory_path: Path) -> set[Path]:
 
     assert directory_path.is_absolute()
 
-    def decode_path(b: bytes) -> Path:
-        return Path(b.decode("unicode_escape").encode("latin1").decode("utf-8"))
+    # the mount point is the fifth field, so don't split the rest of each line
 
-    all_mount_points = {
-        decode_path(line.split()[4])
-        for line in Path("/proc/self/mountinfo").read_bytes().split(b"\n")
-        if line
-    }
+    with Path("/proc/self/mountinfo").open("rb") as file:
+        all_mount_points = {
+            _decode_mountinfo_path(line.split(b" ", 5)[4])
+            for line in file
+            if line.strip()
+        }
 
     assert all(mp.is_absolute() for mp in all_mount_points)
 
-    mount_points_under_dir = {
-        mp for mp in all_mount_points if directory_path in mp.parents
-    }
+    return _find_top_level_paths(directory_path, all_mount_points)
+
+
+def _find_top_level_paths(
+    directory_path: Path, paths: Iterable[Path]
+) -> set[Path]:
+
+    prefix = str(directory_path).rstrip("/") + "/"
+
+    # Sorting with "/" mapped to the lowest character makes the descendants of
+    # each path immediately follow it, so each path only has to be compared to
+    # the last top-level path found.
+
+    paths_under_dir = sorted(
+        (
+            str(path)
+            for path in paths
+            if path != directory_path and str(path).startswith(prefix)
+        ),
+        key=lambda p: p.replace("/", "\0"),
+    )
+
+    top_level_paths: list[str] = []
+
+    for path in paths_under_dir:
+        if not top_level_paths or not path.startswith(
+            f"{top_level_paths[-1]}/"
+        ):
+            top_level_paths.append(path)
 
-    return {
-        mp
-        for mp in mount_points_under_dir
-        if mount_points_under_dir.isdisjoint(mp.parents)
-    }
+    return set(map(Path, top_level_paths))
 
 
 # ---------------------------------------------------------------------------- #
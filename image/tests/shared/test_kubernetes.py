@@ -0,0 +1,343 @@
+# ---------------------------------------------------------------------------- #
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Sequence
+from decimal import (
+    ROUND_CEILING,
+    ROUND_FLOOR,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    Decimal,
+)
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pytest
+from kubernetes.utils import parse_quantity  # type: ignore
+from kubernetes_asyncio.client import ApiException  # type: ignore
+
+from pav.shared import kubernetes
+from pav.shared.kubernetes import (
+    _atomically_modify_object,
+    _watch_all_objects,
+    parse_and_round_quantity,
+)
+
+# ---------------------------------------------------------------------------- #
+
+
+class TestParseAndRoundQuantity:
+
+    quantities: Sequence[object] = [
+        0,
+        42,
+        True,
+        "0",
+        "42",
+        "+42",
+        "-42",
+        "007",
+        *(
+            f"{sign}{number}{suffix}"
+            for sign in ["", "-"]
+            for number in ["1", "3", "1000"]
+            for suffix in "k K M G T P E Ki Mi Gi Ti Pi Ei".split()
+        ),
+        *(
+            f"{sign}{number}{suffix}"
+            for sign in ["", "-"]
+            for number in ["0.5", "1.5", "2.5", "0.001", "1.", ".5", "3.75"]
+            for suffix in ["", "n", "u", "m", "k", "Ki", "Mi"]
+        ),
+        "1e3",
+        "1E3",
+        "-1e-3",
+        "1500m",
+        "+.5Ki",
+        "1.234567n",
+        "0.0000000015",
+        "999999999999.9999999999999E",
+        " 42",
+        1.5,
+        Decimal("2.5"),
+    ]
+
+    @pytest.mark.parametrize("quantity", quantities)
+    @pytest.mark.parametrize(
+        "rounding_mode",
+        [ROUND_HALF_EVEN, ROUND_FLOOR, ROUND_CEILING, ROUND_HALF_UP],
+    )
+    def test_valid(self, quantity: object, rounding_mode: str) -> None:
+
+        expected = int(
+            parse_quantity(quantity).to_integral_value(rounding=rounding_mode)
+        )
+
+        result = parse_and_round_quantity(quantity, rounding_mode=rounding_mode)
+
+        assert type(result) is int
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        "quantity", ["", ".", "+", "-Ki", "Ki", "1ki", "1KiB", "1Ki\n", "abc"]
+    )
+    def test_invalid(self, quantity: object) -> None:
+
+        with pytest.raises(ValueError):
+            parse_and_round_quantity(quantity)
+
+
+# ---------------------------------------------------------------------------- #
+
+
+class TestWatchAllObjects:
+    class FakeList:
+        """A list function returning the given pages, which are lists of
+        objects, linked together by continue tokens. Raises `errors[i]` instead
+        for call `i`, if present."""
+
+        def __init__(
+            self,
+            pages: Sequence[Sequence[object]],
+            errors: Optional[dict[int, Exception]] = None,
+        ) -> None:
+            self.pages = pages
+            self.errors = errors or {}
+            self.continue_tokens: list[Optional[str]] = []
+
+        async def __call__(
+            self, *, limit: int, _continue: Optional[str], **kwargs: Any
+        ) -> SimpleNamespace:
+
+            assert limit == kubernetes._LIST_PAGE_SIZE
+
+            call = len(self.continue_tokens)
+            self.continue_tokens.append(_continue)
+
+            if call in self.errors:
+                raise self.errors[call]
+
+            index = 0 if _continue is None else int(_continue)
+            is_last = index == len(self.pages) - 1
+
+            return SimpleNamespace(
+                items=list(self.pages[index]),
+                metadata=SimpleNamespace(
+                    resource_version="1",
+                    _continue=None if is_last else str(index + 1),
+                ),
+            )
+
+    @staticmethod
+    def make_callback(
+        seen: list[object], stop_at: object
+    ) -> Callable[[object, bool], Coroutine[Any, Any, None]]:
+        """A callback that records objects, and stops at `stop_at`."""
+
+        async def callback(obj: object, exists: bool) -> None:
+            assert exists
+            seen.append(obj)
+            if obj == stop_at:
+                raise StopAsyncIteration
+
+        return callback
+
+    @pytest.mark.asyncio
+    async def test_pages(self) -> None:
+
+        list_fn = self.FakeList([["a", "b"], [], ["c"]])
+        seen: list[object] = []
+
+        await _watch_all_objects(list_fn, self.make_callback(seen, "c"))
+
+        assert list_fn.continue_tokens == [None, "1", "2"]
+        assert seen == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_gone_while_listing(self) -> None:
+
+        # the whole list is retried, so earlier pages are seen again
+
+        list_fn = self.FakeList(
+            [["a", "b"], ["c"]], errors={1: ApiException(status=410)}
+        )
+        seen: list[object] = []
+
+        await _watch_all_objects(list_fn, self.make_callback(seen, "c"))
+
+        assert list_fn.continue_tokens == [None, "1", None, "1"]
+        assert seen == ["a", "b", "a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_other_error_while_listing(self) -> None:
+
+        list_fn = self.FakeList(
+            [["a"], ["b"]], errors={1: ApiException(status=500)}
+        )
+        seen: list[object] = []
+
+        with pytest.raises(ApiException) as e:
+            await _watch_all_objects(list_fn, self.make_callback(seen, "b"))
+
+        assert e.value.status == 500
+        assert list_fn.continue_tokens == [None, "1"]
+        assert seen == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_gone_from_callback(self) -> None:
+
+        list_fn = self.FakeList([["a"], ["b"]])
+
+        async def callback(obj: object, exists: bool) -> None:
+            raise ApiException(status=410)
+
+        with pytest.raises(ApiException) as e:
+            await _watch_all_objects(list_fn, callback)
+
+        assert e.value.status == 410
+        assert list_fn.continue_tokens == [None]
+
+    @pytest.mark.asyncio
+    async def test_return_if_no_matches(self) -> None:
+
+        list_fn = self.FakeList([[], [], []])
+        seen: list[object] = []
+
+        await _watch_all_objects(
+            list_fn, self.make_callback(seen, None), return_if_no_matches=True
+        )
+
+        assert list_fn.continue_tokens == [None, "1", "2"]
+        assert seen == []
+
+    @pytest.mark.asyncio
+    async def test_return_if_no_matches_with_match_in_later_page(self) -> None:
+
+        list_fn = self.FakeList([[], ["a"]])
+        seen: list[object] = []
+
+        await _watch_all_objects(
+            list_fn, self.make_callback(seen, "a"), return_if_no_matches=True
+        )
+
+        assert list_fn.continue_tokens == [None, "1"]
+        assert seen == ["a"]
+
+
+# ---------------------------------------------------------------------------- #
+
+
+class TestAtomicallyModifyObject:
+    class FakeObject:
+        def __init__(self) -> None:
+            self.value = 0
+
+        def to_dict(self) -> dict[str, object]:
+            return {"value": self.value}
+
+    class FakeServer:
+        """Stores a single object, and tracks how many modifications of it are
+        in progress, i.e., between reading and replacing it."""
+
+        def __init__(self) -> None:
+            self.value = 0
+            self.active = 0
+            self.max_active = 0
+            self.replace_started = asyncio.Event()
+            self.replace_allowed = asyncio.Event()
+            self.replace_allowed.set()
+
+        async def read_fn(
+            self, name: str, namespace: str
+        ) -> TestAtomicallyModifyObject.FakeObject:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0)
+            obj = TestAtomicallyModifyObject.FakeObject()
+            obj.value = self.value
+            return obj
+
+        async def replace_fn(
+            self,
+            name: str,
+            namespace: str,
+            body: TestAtomicallyModifyObject.FakeObject,
+        ) -> TestAtomicallyModifyObject.FakeObject:
+            try:
+                self.replace_started.set()
+                await self.replace_allowed.wait()
+                self.value = body.value
+                return body
+            finally:
+                self.active -= 1
+
+    @staticmethod
+    def increment(obj: TestAtomicallyModifyObject.FakeObject) -> None:
+        obj.value += 1
+
+    @pytest.mark.asyncio
+    async def test_serialized(self) -> None:
+
+        server = self.FakeServer()
+
+        await asyncio.gather(
+            *(
+                _atomically_modify_object(
+                    read_fn=server.read_fn,
+                    replace_fn=server.replace_fn,
+                    name="obj",
+                    namespace="ns",
+                    modifier=self.increment,
+                )
+                for _ in range(10)
+            )
+        )
+
+        assert server.value == 10
+        assert server.max_active == 1
+        assert kubernetes._object_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled(self) -> None:
+
+        server = self.FakeServer()
+        server.replace_allowed.clear()
+
+        tasks = [
+            asyncio.ensure_future(
+                _atomically_modify_object(
+                    read_fn=server.read_fn,
+                    replace_fn=server.replace_fn,
+                    name="obj",
+                    namespace="ns",
+                    modifier=self.increment,
+                )
+            )
+            for _ in range(3)
+        ]
+
+        # tasks[0] holds the lock while the others wait for it
+
+        await server.replace_started.wait()
+        assert len(kubernetes._object_locks) == 1
+
+        # cancel a waiter, then the holder, and let the last one finish
+
+        tasks[1].cancel()
+        tasks[0].cancel()
+        server.replace_allowed.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert isinstance(results[1], asyncio.CancelledError)
+        assert isinstance(results[2], self.FakeObject)
+        assert results[2].value == 1
+        assert server.value == 1
+        assert server.max_active == 1
+        assert kubernetes._object_locks == {}
+
+
+# ---------------------------------------------------------------------------- #
@@ -0,0 +1,160 @@
+# ---------------------------------------------------------------------------- #
+
+from __future__ import annotations
+
+import copy
+import functools
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yamale  # type: ignore
+
+from pav.shared.provisioner import _get_field_validator, _get_validator
+
+# ---------------------------------------------------------------------------- #
+
+
+def _make_yamale_schema(with_templates: bool) -> Any:
+
+    schema_text = (
+        Path(__file__).parent / "provisioner-schema.yaml"
+    ).read_text()
+
+    return yamale.make_schema(
+        content=schema_text.format(
+            template="include('template')," if with_templates else ""
+        )
+    )
+
+
+def _is_valid_yamale(schema: Any, obj: object) -> bool:
+
+    try:
+        yamale.validate(schema=schema, data=[(obj, None)])
+    except yamale.YamaleError:
+        return False
+    else:
+        return True
+
+
+_VALUES: Sequence[object] = [
+    None,
+    True,
+    0,
+    1,
+    -3,
+    1.0,
+    1.5,
+    "",
+    "x",
+    "-3",
+    "1Gi",
+    "1.5Gi",
+    "1Gi\n",
+    [],
+    [1],
+    ["Filesystem"],
+    ["Filesystem", "Block"],
+    ["Filesystem", "X"],
+    ["ReadWriteOnce", "ReadOnlyMany", "ReadWriteMany"],
+    ["Dynamic", "Static"],
+    {},
+    {"spec": {}},
+    {"podTemplate": {}},
+]
+
+_FIELDS: Sequence[tuple[str, Sequence[str]]] = [
+    (
+        "volumeValidation",
+        [
+            "volumeModes",
+            "accessModes",
+            "minCapacity",
+            "maxCapacity",
+            "podTemplate",
+        ],
+    ),
+    ("volumeCreation", ["handle", "capacity", "podTemplate"]),
+    ("volumeDeletion", ["podTemplate"]),
+    ("volumeStaging", ["podTemplate"]),
+    ("volumeUnstaging", ["podTemplate"]),
+]
+
+
+class TestValidator:
+    """Ensure that the JSON Schema provisioner validator accepts exactly the
+    same objects as the yamale provisioner schema with templates."""
+
+    base_obj: Any = {
+        "apiVersion": "pav.albertofaria.github.io/v1alpha1",
+        "kind": "PavProvisioner",
+        "metadata": {"name": "provisioner"},
+        "spec": {
+            "provisioningModes": ["Dynamic"],
+            "volumeStaging": {"podTemplate": {}},
+        },
+    }
+
+    def test(self) -> None:
+
+        yamale_schema = _make_yamale_schema(with_templates=True)
+
+        def with_value(path: Sequence[str], value: object) -> object:
+            obj = copy.deepcopy(self.base_obj)
+            parent = functools.reduce(lambda o, k: o[k], path[:-1], obj)
+            parent[path[-1]] = value
+            return obj
+
+        def without(path: Sequence[str]) -> object:
+            obj = copy.deepcopy(self.base_obj)
+            parent = functools.reduce(lambda o, k: o[k], path[:-1], obj)
+            del parent[path[-1]]
+            return obj
+
+        objs: list[object] = [None, "x", [], {}, self.base_obj]
+
+        for key in ["apiVersion", "kind", "metadata", "spec"]:
+            objs.append(without([key]))
+
+        for key in ["apiVersion", "kind", "metadata", "spec", "status", "x"]:
+            objs += [with_value([key], value) for value in _VALUES]
+
+        names = ["a", "a-b", "-a", "a" * 63, "a" * 64, "a\n"]
+        objs += [with_value(["metadata", "name"], v) for v in names]
+        objs += [with_value(["metadata", "x"], v) for v in _VALUES]
+
+        for field in ["provisioningModes", "volumeStaging"]:
+            objs.append(without(["spec", field]))
+
+        for (field, keys) in [("provisioningModes", []), *_FIELDS]:
+            for key in [*keys, "x"]:
+                for value in _VALUES:
+                    objs.append(with_value(["spec", field], value))
+                    objs.append(with_value(["spec", field], {key: value}))
+
+        for obj in objs:
+            expected = _is_valid_yamale(yamale_schema, obj)
+            assert _get_validator().is_valid(obj) == expected, obj
+
+
+class TestFieldValidators:
+    """Ensure that the JSON Schema field validators accept exactly the same
+    objects as the yamale provisioner schema without templates."""
+
+    @pytest.mark.parametrize("field, keys", _FIELDS)
+    def test(self, field: str, keys: Sequence[str]) -> None:
+
+        yamale_schema = _make_yamale_schema(with_templates=False)
+        yamale_schema = yamale_schema.includes[field]
+
+        objs: list[object] = [None, "x", [], {}, {"unknown": 1}]
+        objs += [{key: value} for key in keys for value in _VALUES]
+
+        for obj in objs:
+            expected = _is_valid_yamale(yamale_schema, obj)
+            assert _get_field_validator(field).is_valid(obj) == expected, obj
+
+
+# ---------------------------------------------------------------------------- #
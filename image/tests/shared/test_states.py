@@ -0,0 +1,136 @@
+# ---------------------------------------------------------------------------- #
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Optional, get_type_hints
+
+import pytest
+from grpc import StatusCode  # type: ignore
+
+from pav.shared.states import (
+    VolumeProvisioningState,
+    VolumeProvisioningStates,
+    VolumeStagingState,
+    VolumeStagingStates,
+)
+
+# ---------------------------------------------------------------------------- #
+
+_STRINGS = ["", "ns", 'quote " and backslash \\', "naïve ✓ 名前 \U0001f600"]
+
+_VALUES: dict[Any, list[Any]] = {
+    StatusCode: [StatusCode.INVALID_ARGUMENT, StatusCode.RESOURCE_EXHAUSTED],
+    Path: [Path("/"), Path("/a/b c/é")],
+    int: [0, 1, 2 ** 63],
+    bool: [False, True],
+    str: _STRINGS,
+    Optional[int]: [None, 0, 2 ** 63],
+    Optional[str]: [None, *_STRINGS],
+}
+
+# same as the encoding used by to_json() before it switched to orjson
+_OLD_ENCODE: dict[Any, Any] = {
+    StatusCode: lambda sc: sc.name,
+    Path: str,
+    int: str,
+    bool: str,
+    str: str,
+    Optional[int]: lambda i: None if i is None else str(i),
+    Optional[str]: lambda s: s,
+}
+
+
+def _states(cls: type) -> Iterator[Any]:
+    """Instances of `cls` covering all values of each of its fields."""
+
+    types = get_type_hints(cls)
+    values = {field.name: _VALUES[types[field.name]] for field in fields(cls)}
+    count = max(map(len, values.values()), default=1)
+
+    for i in range(count):
+        yield cls(**{name: v[i % len(v)] for (name, v) in values.items()})
+
+
+def _old_to_json(state: Any) -> str:
+    types = get_type_hints(type(state))
+    obj = {
+        field.name: _OLD_ENCODE[types[field.name]](getattr(state, field.name))
+        for field in fields(state)
+    }
+    return json.dumps({"name": type(state).__name__} | obj)
+
+
+_CASES = [
+    *(
+        (VolumeProvisioningState, state)
+        for cls in VolumeProvisioningStates._BY_NAME.values()
+        for state in _states(cls)
+    ),
+    *(
+        (VolumeStagingState, state)
+        for cls in VolumeStagingStates._BY_NAME.values()
+        for state in _states(cls)
+    ),
+]
+
+# ---------------------------------------------------------------------------- #
+
+
+class TestStates:
+    def test_namespaces(self) -> None:
+        assert len(VolumeProvisioningStates._BY_NAME) == 18
+        assert len(VolumeStagingStates._BY_NAME) == 14
+
+    @pytest.mark.parametrize("base, state", _CASES)
+    def test_round_trip(self, base: Any, state: Any) -> None:
+        json_string = state.to_json()
+        assert base.from_json(json_string) == state
+        assert json.loads(json_string) == json.loads(_old_to_json(state))
+
+    @pytest.mark.parametrize("base, state", _CASES)
+    def test_old_format(self, base: Any, state: Any) -> None:
+        assert base.from_json(_old_to_json(state)) == state
+
+    @pytest.mark.parametrize(
+        "base, json_string, expected",
+        [
+            (
+                VolumeProvisioningState,
+                '{"name": "LaunchValidationPod"}',
+                VolumeProvisioningStates.LaunchValidationPod(),
+            ),
+            (
+                VolumeProvisioningState,
+                '{"name": "AwaitCreationPod", "creation_pod_namespace": "ns",'
+                ' "handle": null, "capacity": "1024"}',
+                VolumeProvisioningStates.AwaitCreationPod(
+                    creation_pod_namespace="ns", handle=None, capacity=1024
+                ),
+            ),
+            (
+                VolumeProvisioningState,
+                '{"name": "CreationFailed", "error_code": "INVALID_ARGUMENT",'
+                ' "error_details": "na\\u00efve \\"x\\""}',
+                VolumeProvisioningStates.CreationFailed(
+                    error_code=StatusCode.INVALID_ARGUMENT,
+                    error_details='naïve "x"',
+                ),
+            ),
+            (
+                VolumeStagingState,
+                '{"name": "Staged", "staging_pod_namespace": "\\u540d"}',
+                VolumeStagingStates.Staged(staging_pod_namespace="名"),
+            ),
+        ],
+    )
+    def test_old_annotations(
+        self, base: Any, json_string: str, expected: Any
+    ) -> None:
+        assert base.from_json(json_string) == expected
+
+
+# ---------------------------------------------------------------------------- #
@@ -7,9 +7,16 @@ from dataclasses import dataclass
 from typing import Union
 
 import pytest
+import yaml
 from jinja2 import TemplateSyntaxError, UndefinedError
 
-from pav.shared.templating import evaluate_templates
+from pav.shared import templating
+from pav.shared.templating import (
+    compile_templates,
+    evaluate_templates,
+    has_templates,
+    validate_templates,
+)
 
 # ---------------------------------------------------------------------------- #
 
@@ -97,6 +104,16 @@ class TestEvaluateTemplates:
             context={},
             expected="a42b",
         ),
+        ValidTestCase(
+            objects=["a\n", "a{# b #}", "{{ 'a' }}\n"],
+            context={},
+            expected="a",
+        ),
+        ValidTestCase(
+            objects=["a\r\nb", "a\rb", "a\nb"],
+            context={},
+            expected="a\nb",
+        ),
         ValidTestCase(
             objects=[R"""{% set yaml = true %}x: {{ '[1, "2", 3]' }}"""],
             context={},
@@ -192,14 +209,53 @@ class TestEvaluateTemplates:
         if isinstance(case, TestEvaluateTemplates.ValidTestCase):
 
             for obj in case.objects:
+
                 result = await evaluate_templates(obj, case.context, None)
                 assert result == case.expected
 
+                if not has_templates(obj):
+                    assert obj == case.expected
+
+                for compiled in [
+                    compile_templates(obj),
+                    validate_templates(obj),
+                ]:
+                    for _ in range(2):
+                        result = await evaluate_templates(
+                            compiled, case.context, None
+                        )
+                        assert result == case.expected
+
         else:
 
             for obj in case.objects:
+
                 with pytest.raises(case.error):
                     await evaluate_templates(obj, case.context, None)
 
+                with pytest.raises(case.error):
+                    compiled = compile_templates(obj)
+                    await evaluate_templates(compiled, case.context, None)
+
+    def test_yaml_loader(self) -> None:
+
+        # YAML output is parsed with libyaml when PyYAML was built with it
+
+        loader: type = templating._YamlLoader
+
+        if yaml.__with_libyaml__:
+            assert loader is yaml.CSafeLoader
+        else:
+            assert loader is yaml.SafeLoader
+
+    @pytest.mark.asyncio
+    async def test_yaml_parsing(self) -> None:
+
+        obj = "{% set yaml = true %}{{ output }}"
+        context = {"output": "a: [1, x]\nb: {c: null}"}
+
+        result = await evaluate_templates(obj, context, None)
+        assert result == {"a": [1, "x"], "b": {"c": None}}
+
 
 # ---------------------------------------------------------------------------- #
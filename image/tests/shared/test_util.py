@@ -0,0 +1,78 @@
+# ---------------------------------------------------------------------------- #
+
+from __future__ import annotations
+
+from collections.abc import Set
+from pathlib import Path
+
+import pytest
+
+from pav.shared.util import _decode_mountinfo_path, _find_top_level_paths
+
+# ---------------------------------------------------------------------------- #
+
+
+class TestFindTopLevelPaths:
+
+    paths = {
+        Path(p)
+        for p in [
+            "/",
+            "/a",
+            "/a/b",
+            "/a/b/c",
+            "/a-b",
+            "/a-b/c",
+            "/a.b",
+            "/ab",
+            "/d/e",
+            "/d/e/f",
+            "/d/g",
+        ]
+    }
+
+    @pytest.mark.parametrize(
+        "directory_path, expected",
+        [
+            ("/", {"/a", "/a-b", "/a.b", "/ab", "/d/e", "/d/g"}),
+            ("/a", {"/a/b"}),
+            ("/a/b", {"/a/b/c"}),
+            ("/a/b/c", set()),
+            ("/d", {"/d/e", "/d/g"}),
+            ("/x", set()),
+        ],
+    )
+    def test(self, directory_path: str, expected: Set[str]) -> None:
+
+        result = _find_top_level_paths(Path(directory_path), self.paths)
+        assert result == set(map(Path, expected))
+
+
+# ---------------------------------------------------------------------------- #
+
+
+class TestDecodeMountinfoPath:
+    @pytest.mark.parametrize(
+        "encoded, expected",
+        [
+            (b"/mnt/plain-path_1.x", "/mnt/plain-path_1.x"),
+            (b"/mnt/a\\040b", "/mnt/a b"),
+            (b"/mnt/a\\011b", "/mnt/a\tb"),
+            (b"/mnt/a\\012b", "/mnt/a\nb"),
+            (b"/mnt/a\\134b", "/mnt/a\\b"),
+            (b"/mnt/\\040\\011\\012\\134", "/mnt/ \t\n\\"),
+            ("/mnt/naïve/名前".encode(), "/mnt/naïve/名前"),
+            ("/mnt/é\\040名".encode(), "/mnt/é 名"),
+        ],
+    )
+    def test(self, encoded: bytes, expected: str) -> None:
+
+        assert _decode_mountinfo_path(encoded) == Path(expected)
+
+        # same as the previous decoding, which went through 'unicode_escape'
+
+        previous = encoded.decode("unicode_escape").encode("latin1")
+        assert Path(previous.decode("utf-8")) == Path(expected)
+
+
+# ---------------------------------------------------------------------------- #